@@ -31,7 +31,7 @@ from promptflow._sdk.entities import Run
 from promptflow._sdk.entities._flow import Flow
 from promptflow._utils.dataclass_serializer import serialize
 from promptflow._utils.exception_utils import PromptflowExceptionPresenter
-from promptflow._utils.logger_utils import LogContext
+from promptflow._utils.logger_utils import LogContext, resolve_handlers
 from promptflow.contracts.run_info import FlowRunInfo
 from promptflow.contracts.run_info import RunInfo as NodeRunInfo
 from promptflow.contracts.run_info import Status
@@ -85,7 +85,7 @@ class LoggerOperations(LogContext):
             log_path.touch(exist_ok=True)
 
         for _logger in self._get_execute_loggers_list():
-            for handler in _logger.handlers:
+            for handler in resolve_handlers(_logger):
                 if self.stream is False and isinstance(handler, logging.StreamHandler):
                     handler.setLevel(logging.CRITICAL)
         super().__enter__()
@@ -94,7 +94,7 @@ class LoggerOperations(LogContext):
         super().__exit__(*args)
 
         for _logger in self._get_execute_loggers_list():
-            for handler in _logger.handlers:
+            for handler in resolve_handlers(_logger):
                 if self.stream is False and isinstance(handler, logging.StreamHandler):
                     handler.setLevel(logging.CRITICAL)
 
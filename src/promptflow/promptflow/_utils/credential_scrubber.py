@@ -11,16 +11,35 @@ class CredentialScrubber:
     PLACE_HOLDER = "**data_scrubbed**"
     LENGTH_THRESHOLD = 2
 
+    # Compile default patterns once at class creation, so that constructing a
+    # scrubber does not pay a per-instance regex compile cost. Each pattern
+    # carries the literal substrings at least one of which must be present for
+    # the pattern to possibly match; a substring scan is much cheaper than
+    # running the regex engine on every log line.
+    DEFAULT_REGEX_SET = (
+        (re.compile(r"(?<=sig=)[^\s;&]+", flags=re.IGNORECASE), ("sig=",)),  # Replace signature.
+        (re.compile(r"(?<=key=)[^\s;&]+", flags=re.IGNORECASE), ("key=",)),  # Replace key.
+    )
+
     def __init__(self):
-        self.default_regex_set = set(
-            [
-                r"(?<=sig=)[^\s;&]+",  # Replace signature.
-                r"(?<=key=)[^\s;&]+",  # Replace key.
-            ]
-        )
+        self.default_regex_set = self.DEFAULT_REGEX_SET
         self.default_str_set = set()
         self.custom_regex_set = set()
         self.custom_str_set = set()
+        self._str_regex = None
+        self._str_regex_stale = False
+
+    @classmethod
+    def from_list(cls, credential_list: list):
+        """Build a scrubber for a credential list in a single pass.
+
+        All strings are combined into one alternation regex, so that adding N
+        credentials compiles one pattern instead of doing N scans per scrub.
+        """
+        scrubber = cls()
+        scrubber.custom_str_set = {s for s in credential_list if s is not None and len(s) > cls.LENGTH_THRESHOLD}
+        scrubber._str_regex_stale = True
+        return scrubber
 
     def scrub(self, input: str):
         """Replace sensitive information in input string with PLACE_HOLDER.
@@ -29,19 +48,24 @@ class CredentialScrubber:
         "print accountkey=**data_scrubbed**"
         """
         output = input
-        regex_set = self.default_regex_set.union(self.custom_regex_set)
-        for regex in regex_set:
-            output = re.sub(regex, self.PLACE_HOLDER, output, flags=re.IGNORECASE)
+        lowered = input.lower()
+        for regex, required_substrings in self.default_regex_set:
+            if not any(s in lowered for s in required_substrings):
+                continue
+            output = regex.sub(self.PLACE_HOLDER, output)
+        for regex in self.custom_regex_set:
+            output = regex.sub(self.PLACE_HOLDER, output)
 
-        str_set = self.default_str_set.union(self.custom_str_set)
-        for s in str_set:
-            output = output.replace(s, self.PLACE_HOLDER)
+        if self._str_regex_stale:
+            self._rebuild_str_regex()
+        if self._str_regex is not None:
+            output = self._str_regex.sub(self.PLACE_HOLDER, output)
         return output
 
     def add_regex(self, pattern: str):
         # policy: http://policheck.azurewebsites.net/Pages/TermInfo.aspx?LCID=9&TermID=79458
         """Add regex pattern to checklist."""
-        self.custom_regex_set.add(pattern)
+        self.custom_regex_set.add(re.compile(pattern, flags=re.IGNORECASE))
 
     def add_str(self, s: str):
         """Add string to checklist.
@@ -54,8 +78,23 @@ class CredentialScrubber:
         if len(s) <= self.LENGTH_THRESHOLD:
             return
         self.custom_str_set.add(s)
+        self._str_regex_stale = True
 
     def clear(self):
         """Clear custom regex and string set."""
         self.custom_regex_set = set()
         self.custom_str_set = set()
+        self._str_regex_stale = True
+
+    def _rebuild_str_regex(self):
+        # Rebuilt lazily on the next scrub, so that registering N strings does
+        # not recompile the pattern N times.
+        str_set = self.default_str_set.union(self.custom_str_set)
+        if str_set:
+            # Longest-first, so that a secret containing another secret as a
+            # substring is scrubbed in full.
+            pattern = "|".join(re.escape(s) for s in sorted(str_set, key=len, reverse=True))
+            self._str_regex = re.compile(pattern)
+        else:
+            self._str_regex = None
+        self._str_regex_stale = False
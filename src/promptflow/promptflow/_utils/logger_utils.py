@@ -6,11 +6,18 @@
 # so it should not contain any dependency on azure or azureml-related packages.
 
 
+import atexit
+import contextvars
+import io
 import logging
+import os
 import sys
+import threading
 from contextvars import ContextVar
 from dataclasses import dataclass
 from functools import partial
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 from typing import List, Optional
 
 from promptflow._utils.credential_scrubber import CredentialScrubber
@@ -23,14 +30,53 @@ from promptflow.contracts.run_mode import RunMode
 LOG_FORMAT = "%(asctime)s %(process)7d %(name)-18s %(levelname)-8s %(message)s"
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S %z"
 
+# Single scrubber with the default patterns, shared by all formatters and the
+# scrub_credentials fallback so that its regexes are only compiled once.
+_DEFAULT_SCRUBBER = CredentialScrubber()
 
-class CredentialScrubberFormatter(logging.Formatter):
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that caches the formatted timestamp at second resolution.
+
+    DATETIME_FORMAT has no sub-second component, so records logged within the
+    same second can reuse the localtime + strftime result.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (whole second, formatted string); a single attribute so that reads
+        # from concurrent handler threads see a consistent pair.
+        self._cached_time = (None, None)
+
+    def formatTime(self, record, datefmt=None):
+        if not (datefmt or self.datefmt):
+            # The default format appends milliseconds, which cannot be cached
+            # at second resolution.
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, cached_asctime = self._cached_time
+        if second == cached_second:
+            return cached_asctime
+        asctime = super().formatTime(record, datefmt)
+        self._cached_time = (second, asctime)
+        return asctime
+
+
+class CredentialScrubberFormatter(CachedTimeFormatter):
     """Formatter that scrubs credentials in logs."""
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._default_scrubber = CredentialScrubber()
+        self._default_scrubber = _DEFAULT_SCRUBBER
         self._context_var = ContextVar("credential_scrubber", default=None)
+        # Both content hooks are identity functions in this base class; record
+        # once whether a derived class overrides them so that format() only
+        # pays the extra calls per record when they do something.
+        cls = type(self)
+        self._traceback_hook_overridden = cls._handle_traceback is not CredentialScrubberFormatter._handle_traceback
+        self._customer_content_hook_overridden = (
+            cls._handle_customer_content is not CredentialScrubberFormatter._handle_customer_content
+        )
 
     @property
     def credential_scrubber(self):
@@ -41,10 +87,7 @@ class CredentialScrubberFormatter(logging.Formatter):
 
     def set_credential_list(self, credential_list: List[str]):
         """Set credential list, which will be scrubbed in logs."""
-        credential_scrubber = CredentialScrubber()
-        for c in credential_list:
-            credential_scrubber.add_str(c)
-        self._context_var.set(credential_scrubber)
+        self._context_var.set(CredentialScrubber.from_list(credential_list))
 
     def clear(self):
         """Clear context variable."""
@@ -54,9 +97,17 @@ class CredentialScrubberFormatter(logging.Formatter):
         """Override logging.Formatter's format method and remove credentials from log."""
         s: str = super().format(record)
 
-        s = self._handle_traceback(s, record)
-        s = self._handle_customer_content(s, record)
-        return self.credential_scrubber.scrub(s)
+        if self._traceback_hook_overridden:
+            s = self._handle_traceback(s, record)
+        if self._customer_content_hook_overridden:
+            s = self._handle_customer_content(s, record)
+        if getattr(record, "credentials_scrubbed", False):
+            # Already scrubbed once on the queue listener thread.
+            return s
+        # Inline the context-var read instead of going through the
+        # credential_scrubber property; this runs once per record.
+        scrubber = self._context_var.get() or self._default_scrubber
+        return scrubber.scrub(s)
 
     def _handle_customer_content(self, s: str, record: logging.LogRecord) -> str:
         """Interface method for handling customer content in log message.
@@ -73,10 +124,80 @@ class CredentialScrubberFormatter(logging.Formatter):
         return s
 
 
+class BufferedFileHandler(logging.StreamHandler):
+    """File handler that buffers writes instead of flushing per record.
+
+    A plain logging.FileHandler performs one write() syscall per log line.
+    Buffer records in a fixed-size userspace buffer instead, so small records
+    coalesce into one syscall per buffer fill. A background timer flushes the
+    buffer periodically so low-volume runs still see output in time.
+    """
+
+    BUFFER_SIZE = 65536
+    FLUSH_INTERVAL_SECONDS = 1.0
+
+    def __init__(self, file_path: str, encoding: str = "UTF-8"):
+        stream = io.TextIOWrapper(
+            open(file_path, "ab", buffering=self.BUFFER_SIZE),
+            encoding=encoding,
+            write_through=False,
+            line_buffering=False,
+        )
+        super().__init__(stream)
+        self._closed = False
+        self._schedule_flush()
+
+    def emit(self, record: logging.LogRecord):
+        """Write the record to the buffer without flushing."""
+        try:
+            msg = self.format(record)
+            # One handler instance may be shared by several loggers writing to
+            # the same file, so serialize writes against the flush timer and
+            # other emitting threads.
+            self.acquire()
+            try:
+                self.stream.write(msg + self.terminator)
+            finally:
+                self.release()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        """Flush buffered records and close the stream."""
+        self._closed = True
+        self._flush_timer.cancel()
+        self.acquire()
+        try:
+            if not self.stream.closed:
+                self.stream.flush()
+                self.stream.close()
+        finally:
+            self.release()
+        super().close()
+
+    def _schedule_flush(self):
+        self._flush_timer = threading.Timer(self.FLUSH_INTERVAL_SECONDS, self._periodic_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _periodic_flush(self):
+        if self._closed:
+            return
+        try:
+            self.flush()
+        except ValueError:
+            # Stream was closed concurrently; nothing left to flush.
+            return
+        self._schedule_flush()
+
+
 class FileHandler:
     """Write compliant log to a file."""
 
     def __init__(self, file_path: str, formatter: Optional[logging.Formatter] = None):
+        self._closed = False
         self._stream_handler = self._get_stream_handler(file_path)
         if formatter is None:
             # Default formatter to scrub credentials in log message, exception and stack trace.
@@ -91,16 +212,36 @@ class FileHandler:
 
     def emit(self, record: logging.LogRecord):
         """Write logs."""
+        # Skip formatting (including the scrub pass) for records the stream
+        # handler would reject anyway.
+        if record.levelno < self._stream_handler.level:
+            return
         self._stream_handler.emit(record)
 
+    def set_path(self, file_path: str):
+        """Point the handler at a new file, keeping the formatter and its state."""
+        self._stream_handler.close()
+        self._stream_handler = self._get_stream_handler(file_path)
+        self._stream_handler.setFormatter(self._formatter)
+        self._closed = False
+
+    def flush(self):
+        """Flush buffered logs to the file. Flushing a closed handler is a no-op."""
+        if self._closed:
+            return
+        self._stream_handler.flush()
+
     def close(self):
-        """Close stream handler."""
+        """Close stream handler. Closing twice is a no-op."""
+        if self._closed:
+            return
+        self._closed = True
         self._stream_handler.close()
         self._formatter.clear()
 
     def _get_stream_handler(self, file_path) -> logging.StreamHandler:
         """This method can be overridden by derived class to save log file in cloud."""
-        return logging.FileHandler(file_path, encoding="UTF-8")
+        return BufferedFileHandler(file_path)
 
 
 class FileHandlerConcurrentWrapper(logging.Handler):
@@ -112,6 +253,10 @@ class FileHandlerConcurrentWrapper(logging.Handler):
     def __init__(self):
         super().__init__()
         self._context_var = ContextVar("handler", default=None)
+        # Number of contexts that currently have a file handler set; lets
+        # emit() skip the context-var lookup entirely while the wrapper is
+        # idle (e.g. before any LogContext is entered).
+        self._active_contexts = 0
 
     @property
     def handler(self) -> FileHandler:
@@ -119,39 +264,220 @@ class FileHandlerConcurrentWrapper(logging.Handler):
 
     @handler.setter
     def handler(self, handler: FileHandler):
-        self._context_var.set(handler)
+        self.acquire()
+        try:
+            if (self._context_var.get() is None) != (handler is None):
+                self._active_contexts += 1 if handler is not None else -1
+            self._context_var.set(handler)
+        finally:
+            self.release()
 
     def emit(self, record: logging.LogRecord):
         """Override logging.Handler's emit method.
 
         Get inner file handler in current context and write log.
         """
+        if self._active_contexts == 0 or record.levelno < self.level:
+            return
         stream_handler: FileHandler = self._context_var.get()
         if stream_handler is None:
             return
         stream_handler.emit(record)
 
+    def flush(self):
+        """Flush buffered logs of the file handler in current context."""
+        handler: FileHandler = self._context_var.get()
+        if handler:
+            handler.flush()
+
     def clear(self):
         """Close file handler and clear context variable."""
         handler: FileHandler = self._context_var.get()
         if handler:
+            handler.close()
+        self.handler = None
+
+
+class LogQueueListener(QueueListener):
+    """Listener that owns the real stdout/file handlers of the executor loggers.
+
+    Handlers run on a single background thread, so the calling thread only
+    pays a queue append per record, and the one drain thread preserves the
+    order records were enqueued in — also across loggers appending to the
+    same file. Each logger registers its real handlers by name and a record
+    is dispatched to the handlers of the logger that emitted it. Since the
+    file handler and formatter state are context-local, each record is
+    handled inside the context captured when it was enqueued. A
+    `threading.Event` put on the queue acts as a flush barrier: it is set
+    once every record queued before it has been handled.
+    """
+
+    def __init__(self, queue: SimpleQueue):
+        super().__init__(queue)
+        self._handlers_by_logger = {}
+
+    def register_handlers(self, logger_name: str, handlers: List[logging.Handler]):
+        """Register the real handlers of a logger, keyed by its name."""
+        self._handlers_by_logger[logger_name] = tuple(handlers)
+
+    def handle(self, record):
+        if isinstance(record, threading.Event):
+            record.set()
+            return
+        context: Optional[contextvars.Context] = getattr(record, "caller_context", None)
+        if context is not None:
+            context.run(self._scrub_and_handle, record)
+        else:
+            self._scrub_and_handle(record)
+
+    def _scrub_and_handle(self, record):
+        # A record that goes to both stdout and the log file used to pay the
+        # scrub pass once per handler; scrub the message once here and mark
+        # the record so the formatters skip their own pass.
+        scrubber = _SHARED_STDOUT_FORMATTER._context_var.get() or _DEFAULT_SCRUBBER
+        record.msg = scrubber.scrub(record.msg)
+        record.message = record.msg
+        record.credentials_scrubbed = True
+        for handler in self._handlers_by_logger.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class LogQueueHandler(QueueHandler):
+    """Handler that feeds a logger's records to the shared LogQueueListener.
+
+    Keeps references to the listener and to the logger's real handlers so
+    that callers (e.g. LogContext) can still reach them.
+    """
+
+    FLUSH_TIMEOUT_SECONDS = 10
+
+    def __init__(self, queue: SimpleQueue, listener: LogQueueListener, handlers: List[logging.Handler]):
+        super().__init__(queue)
+        self.listener = listener
+        self.handlers = handlers
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        # The handlers behind the listener read context-local state (file
+        # handler, credential scrubber), so capture the caller's context here.
+        record.caller_context = contextvars.copy_context()
+        return record
+
+    def flush(self):
+        """Block until all currently queued records have been handled."""
+        if self.listener._thread is not None:
+            event = threading.Event()
+            self.queue.put(event)
+            event.wait(timeout=self.FLUSH_TIMEOUT_SECONDS)
+        for handler in self.handlers:
+            handler.flush()
+
+
+# Keep track of the started listeners so that they can be restarted in child
+# processes; a forked child inherits the queues but not the listener threads.
+_queue_listeners: List[LogQueueListener] = []
+
+
+def _restart_queue_listeners_in_child():
+    for listener in _queue_listeners:
+        # Records enqueued before the fork belong to the parent, whose
+        # listener still handles them; draining them here as well would
+        # duplicate lines in the shared log file.
+        queue = listener.queue
+        while not queue.empty():
             try:
-                handler.close()
-            except:  # NOQA: E722
-                # Do nothing if handler close failed.
-                pass
-        self._context_var.set(None)
+                queue.get_nowait()
+            except Exception:
+                break
+        listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_queue_listeners_in_child)
+
+
+# One scrubbing formatter shared by the stdout handlers of all loggers built
+# by get_logger; LogContext applies credential lists to all of them uniformly
+# anyway, so per-logger formatter state bought nothing.
+_SHARED_STDOUT_FORMATTER = CredentialScrubberFormatter(fmt=LOG_FORMAT, datefmt=DATETIME_FORMAT)
+
+
+# One queue and listener shared by all loggers built by get_logger: a single
+# drain thread preserves global enqueue order across them, which matters when
+# several loggers append to the same log file.
+_shared_log_queue: SimpleQueue = SimpleQueue()
+_shared_listener = LogQueueListener(_shared_log_queue)
 
 
 def get_logger(name: str) -> logging.Logger:
-    logger = logging.Logger(name)
-    logger.addHandler(FileHandlerConcurrentWrapper())
+    logger = logging.getLogger(name)
+    if hasattr(logger, "_file_wrappers_and_formatters"):
+        # Already initialized; installing handlers again would make every
+        # record format, scrub and emit once per duplicate handler.
+        return logger
+    # Keep the behavior of a standalone Logger: handle every record itself and
+    # do not hand records to ancestor loggers.
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
     stdout_handler = logging.StreamHandler(sys.stdout)
-    stdout_handler.setFormatter(CredentialScrubberFormatter(fmt=LOG_FORMAT, datefmt=DATETIME_FORMAT))
-    logger.addHandler(stdout_handler)
+    stdout_handler.setFormatter(_SHARED_STDOUT_FORMATTER)
+    # The real handlers live behind the shared queue listener, so that log I/O
+    # and credential scrubbing do not block the calling thread.
+    handlers = (FileHandlerConcurrentWrapper(), stdout_handler)
+    _shared_listener.register_handlers(name, handlers)
+    if _shared_listener._thread is None:
+        _shared_listener.start()
+        atexit.register(_shared_listener.stop)
+        _queue_listeners.append(_shared_listener)
+    logger.addHandler(LogQueueHandler(_shared_log_queue, _shared_listener, handlers))
+    # The handler layout of these loggers never changes, so cache the resolved
+    # file wrapper and scrubbing formatter to spare LogContext the isinstance
+    # scan on every context enter/exit.
+    logger._file_wrappers_and_formatters = ([handlers[0]], [stdout_handler.formatter])
     return logger
 
 
+def resolve_handlers(logger_: logging.Logger) -> List[logging.Handler]:
+    """Return the handlers that actually write the logger's records.
+
+    Loggers created by `get_logger` hold a single queue handler; resolve
+    through it to the stdout/file handlers owned by its listener.
+    """
+    handlers = []
+    for handler in logger_.handlers:
+        if isinstance(handler, LogQueueHandler):
+            handlers.extend(handler.handlers)
+        else:
+            handlers.append(handler)
+    return handlers
+
+
+def _resolve_wrappers_and_formatters(logger_: logging.Logger):
+    """Return the file wrappers and credential-scrubbing formatters of a logger.
+
+    For loggers created by `get_logger` the result is cached on the logger;
+    other loggers (e.g. an input_logger) are scanned on each call since their
+    handlers may change.
+    """
+    cached = getattr(logger_, "_file_wrappers_and_formatters", None)
+    if cached is not None:
+        return cached
+    wrappers, formatters = [], []
+    for handler in resolve_handlers(logger_):
+        if isinstance(handler, FileHandlerConcurrentWrapper):
+            wrappers.append(handler)
+        elif isinstance(handler.formatter, CredentialScrubberFormatter):
+            formatters.append(handler.formatter)
+    return wrappers, formatters
+
+
+def flush_logger(logger_: logging.Logger):
+    """Flush the logger's handlers, waiting for queued records to be written."""
+    for handler in logger_.handlers:
+        handler.flush()
+
+
 # Logs by flow_logger will only be shown in flow mode.
 # These logs should contain all detailed logs from executor and runtime.
 flow_logger = get_logger("execution.flow")
@@ -164,8 +490,13 @@ bulk_logger = get_logger("execution.bulk")
 # such as error logs.
 logger = get_logger("execution")
 
+# File wrapper of the "execution" logger, resolved once for scrub_credentials.
+_execution_file_wrapper = logger._file_wrappers_and_formatters[0][0]
+
 
-logger_contexts = []
+# Stack of active LogContexts as an immutable tuple, so that each thread/async
+# task sees its own view and enter/exit needs no lock.
+_logger_contexts: ContextVar = ContextVar("logger_contexts", default=())
 
 
 @dataclass
@@ -177,6 +508,16 @@ class LogContext:
     credential_list: Optional[List[str]] = None  # These credentials will be scrubbed in logs.
     input_logger: logging.Logger = None  # If set, then context will also be set for input_logger.
 
+    def __post_init__(self):
+        # run_mode is fixed after construction, so resolve the loggers that
+        # get the log path once instead of on every __enter__.
+        # For Batch run mode, set log path for bulk_logger,
+        # otherwise for flow_logger.
+        if self.run_mode == RunMode.Batch:
+            self._path_loggers = (logger, bulk_logger)
+        else:
+            self._path_loggers = (logger, flow_logger)
+
     def get_initializer(self):
         return partial(
             LogContext, file_path=self.file_path, run_mode=self.run_mode, credential_list=self.credential_list
@@ -184,25 +525,25 @@ class LogContext:
 
     @staticmethod
     def get_current() -> Optional["LogContext"]:
-        global logger_contexts
-        if logger_contexts:
-            return logger_contexts[-1]
+        stack = _logger_contexts.get()
+        if stack:
+            return stack[-1]
         return None
 
     @staticmethod
     def set_current(context: "LogContext"):
-        global logger_contexts
         if isinstance(context, LogContext):
-            logger_contexts.append(context)
+            _logger_contexts.set(_logger_contexts.get() + (context,))
 
     @staticmethod
     def clear_current():
-        global logger_contexts
-        if logger_contexts:
-            logger_contexts.pop()
+        stack = _logger_contexts.get()
+        if stack:
+            _logger_contexts.set(stack[:-1])
 
     def __enter__(self):
         self._set_log_path()
+        self._scrub_targets = self._collect_scrub_targets()
         self._set_credential_list()
         LogContext.set_current(self)
 
@@ -212,48 +553,58 @@ class LogContext:
         if self.input_logger:
             all_logger_list.append(self.input_logger)
         for logger_ in all_logger_list:
-            for handler in logger_.handlers:
-                if isinstance(handler, FileHandlerConcurrentWrapper):
-                    handler.clear()
-                elif isinstance(handler.formatter, CredentialScrubberFormatter):
-                    handler.formatter.clear()
+            # Write out queued records before closing the file handler.
+            flush_logger(logger_)
+            wrappers, formatters = _resolve_wrappers_and_formatters(logger_)
+            for wrapper in wrappers:
+                wrapper.clear()
+            for formatter in formatters:
+                formatter.clear()
         LogContext.clear_current()
 
     def _set_log_path(self):
         if not self.file_path:
             return
 
+        # All loggers of this context share one FileHandler: a single buffer
+        # per file keeps records in emission order; separate buffers with
+        # independent flush timers would interleave them arbitrarily.
+        file_handler = FileHandler(self.file_path)
         logger_list = self._get_loggers_to_set_path()
         for logger_ in logger_list:
-            for log_handler in logger_.handlers:
-                if isinstance(log_handler, FileHandlerConcurrentWrapper):
-                    handler = FileHandler(self.file_path)
-                    log_handler.handler = handler
+            wrappers, _ = _resolve_wrappers_and_formatters(logger_)
+            for wrapper in wrappers:
+                wrapper.handler = file_handler
 
-    def _set_credential_list(self):
-        # Set credential list to all loggers.
+    def _collect_scrub_targets(self) -> list:
+        """Enumerate the handlers/formatters that take the credential list.
+
+        Run once per context, after the file handlers are set up, so that
+        _set_credential_list is a single flat loop without duplicates (the
+        stdout handlers share one formatter).
+        """
         all_logger_list = self._get_execute_loggers_list()
         if self.input_logger:
             all_logger_list.append(self.input_logger)
-        credential_list = self.credential_list or []
+        targets = []
         for logger_ in all_logger_list:
-            for handler in logger_.handlers:
-                if isinstance(handler, FileHandlerConcurrentWrapper) and handler.handler:
-                    handler.handler.set_credential_list(credential_list)
-                elif isinstance(handler.formatter, CredentialScrubberFormatter):
-                    handler.formatter.set_credential_list(credential_list)
+            wrappers, formatters = _resolve_wrappers_and_formatters(logger_)
+            for wrapper in wrappers:
+                if wrapper.handler:
+                    targets.append(wrapper.handler)
+            targets.extend(formatters)
+        return list(dict.fromkeys(targets))
+
+    def _set_credential_list(self):
+        # Set credential list to all loggers.
+        credential_list = self.credential_list or []
+        for target in self._scrub_targets:
+            target.set_credential_list(credential_list)
 
     def _get_loggers_to_set_path(self) -> List[logging.Logger]:
-        logger_list = [logger]
+        logger_list = list(self._path_loggers)
         if self.input_logger:
             logger_list.append(self.input_logger)
-
-        # For Batch run mode, set log path for bulk_logger,
-        # otherwise for flow_logger.
-        if self.run_mode == RunMode.Batch:
-            logger_list.append(bulk_logger)
-        else:
-            logger_list.append(flow_logger)
         return logger_list
 
     @classmethod
@@ -266,12 +617,17 @@ def update_log_path(log_path: str, input_logger: logging.Logger = None):
     logger_list = [logger, bulk_logger, flow_logger]
     if input_logger:
         logger_list.append(input_logger)
+    # The loggers of a context share one FileHandler; re-point it only once.
+    handlers_done = []
     for logger_ in logger_list:
-        for wrapper in logger_.handlers:
-            if isinstance(wrapper, FileHandlerConcurrentWrapper):
-                handler: FileHandler = wrapper.handler
-                if handler:
-                    wrapper.handler = type(handler)(log_path, handler._formatter)
+        # Write out queued records before swapping the file handler.
+        flush_logger(logger_)
+        wrappers, _ = _resolve_wrappers_and_formatters(logger_)
+        for wrapper in wrappers:
+            handler: FileHandler = wrapper.handler
+            if handler and not any(handler is h for h in handlers_done):
+                handlers_done.append(handler)
+                handler.set_path(log_path)
 
 
 def scrub_credentials(s: str):
@@ -280,10 +636,9 @@ def scrub_credentials(s: str):
     For example, for input string: "print accountkey=accountKey", the output will be:
     "print accountkey=**data_scrubbed**"
     """
-    for h in logger.handlers:
-        if isinstance(h, FileHandlerConcurrentWrapper):
-            if h.handler and h.handler._formatter:
-                credential_scrubber = h.handler._formatter.credential_scrubber
-                if credential_scrubber:
-                    return credential_scrubber.scrub(s)
-    return CredentialScrubber().scrub(s)
+    handler = _execution_file_wrapper.handler
+    if handler and handler._formatter:
+        credential_scrubber = handler._formatter.credential_scrubber
+        if credential_scrubber:
+            return credential_scrubber.scrub(s)
+    return _DEFAULT_SCRUBBER.scrub(s)
@@ -2,15 +2,25 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ---------------------------------------------------------
 
+import copy
+import functools
 import logging
+import re
 import sys
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, fields, is_dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import yaml
 
+try:
+    # The libyaml-based loader is roughly an order of magnitude faster than
+    # the pure-Python one; fall back when PyYAML is built without libyaml.
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 from promptflow.exceptions import ErrorTarget
 
 from .._utils.dataclass_serializer import serialize
@@ -21,6 +31,23 @@ from .tool import ConnectionType, Tool, ToolType, ValueType
 logger = logging.getLogger(__name__)
 
 
+def _asdict_without_falsy(value):
+    # Allocation-light replacement for dataclasses.asdict with a filtering
+    # dict_factory: asdict deep-copies every field value and materializes
+    # intermediate tuple lists only for the falsy entries to be dropped.
+    result = {}
+    for f in fields(value):
+        v = getattr(value, f.name)
+        if v:
+            result[f.name] = _asdict_without_falsy(v) if is_dataclass(v) else v
+    return result
+
+
+# All plain value types; input keys whose types are all in this set cannot be
+# connection keys. Built once instead of per connection lookup.
+_VALUE_TYPES = frozenset(v.value.lower() for v in ValueType)
+
+
 class InputValueType(Enum):
     """The enum of input value type."""
 
@@ -31,6 +58,14 @@ class InputValueType(Enum):
 
 FLOW_INPUT_PREFIX = "flow."
 FLOW_INPUT_PREFIXES = [FLOW_INPUT_PREFIX, "inputs."]  # Use a list for backward compatibility
+# str.startswith accepts a tuple and checks all prefixes in one call.
+_FLOW_INPUT_PREFIX_TUPLE = tuple(FLOW_INPUT_PREFIXES)
+# A "${...}" reference; everything else is a literal. \A/\Z anchors (not $,
+# which also matches before a trailing newline) so that values like
+# "${node.output}\n" from YAML block scalars stay literals.
+_REFERENCE_PATTERN = re.compile(r"\A\$\{(.*)\}\Z", re.DOTALL)
+# A flow-input reference with its prefix captured, e.g. "flow.url" or "inputs.url".
+_FLOW_INPUT_PATTERN = re.compile(r"^(flow\.|inputs\.)(.*)$", re.DOTALL)
 
 
 @dataclass
@@ -44,9 +79,11 @@ class InputAssignment:
 
     def serialize(self):
         """Serialize the input assignment to a string."""
-        if self.value_type == InputValueType.FLOW_INPUT:
+        # Enum members are singletons, so identity comparison is the cheapest
+        # dispatch here; this runs for every serialized input assignment.
+        if self.value_type is InputValueType.FLOW_INPUT:
             return f"${{{FLOW_INPUT_PREFIX}{self.value}}}"
-        elif self.value_type == InputValueType.NODE_REFERENCE:
+        elif self.value_type is InputValueType.NODE_REFERENCE:
             if self.property:
                 return f"${{{self.value}.{self.section}.{self.property}}}"
             return f"${{{self.value}.{self.section}}}"
@@ -63,14 +100,13 @@ class InputAssignment:
         :return: The input assignment constructed from the string.
         :rtype: InputAssignment
         """
-        literal_value = InputAssignment(value, InputValueType.LITERAL)
-        if isinstance(value, str) and value.startswith("$") and len(value) > 2:
-            value = value[1:]
-            if value[0] != "{" or value[-1] != "}":
-                return literal_value
-            value = value[1:-1]
-            return InputAssignment.deserialize_reference(value)
-        return literal_value
+        # This runs once per node input on every flow load; one compiled-regex
+        # match decides literal vs. reference without intermediate slices.
+        if isinstance(value, str):
+            match = _REFERENCE_PATTERN.match(value)
+            if match:
+                return InputAssignment.deserialize_reference(match.group(1))
+        return InputAssignment(value, InputValueType.LITERAL)
 
     @staticmethod
     def deserialize_reference(value: str) -> "InputAssignment":
@@ -95,12 +131,14 @@ class InputAssignment:
         :rtype: InputAssignment
         """
         value_type = InputValueType.NODE_REFERENCE
-        if "." not in data:
+        # partition scans once and reports whether the separator was found,
+        # replacing the "in" pre-check plus split pair.
+        node_name, sep, port_name = data.partition(".")
+        if not sep:
             return InputAssignment(data, value_type, "output")
-        node_name, port_name = data.split(".", 1)
-        if "." not in port_name:
+        section, sep, property = port_name.partition(".")
+        if not sep:
             return InputAssignment(node_name, value_type, port_name)
-        section, property = port_name.split(".", 1)
         return InputAssignment(node_name, value_type, section, property)
 
 
@@ -119,10 +157,7 @@ class FlowInputAssignment(InputAssignment):
         :return: Whether the input value is a flow input.
         :rtype: bool
         """
-        for prefix in FLOW_INPUT_PREFIXES:
-            if input_value.startswith(prefix):
-                return True
-        return False
+        return input_value.startswith(_FLOW_INPUT_PREFIX_TUPLE)
 
     @staticmethod
     def deserialize(value: str) -> "FlowInputAssignment":
@@ -133,11 +168,11 @@ class FlowInputAssignment(InputAssignment):
         :return: The flow input assignment constructed from the string.
         :rtype: FlowInputAssignment
         """
-        for prefix in FLOW_INPUT_PREFIXES:
-            if value.startswith(prefix):
-                return FlowInputAssignment(
-                    value=value[len(prefix) :], value_type=InputValueType.FLOW_INPUT, prefix=prefix
-                )
+        match = _FLOW_INPUT_PATTERN.match(value)
+        if match:
+            return FlowInputAssignment(
+                value=match.group(2), value_type=InputValueType.FLOW_INPUT, prefix=match.group(1)
+            )
         raise ValueError(f"Unexpected flow input value {value}")
 
 
@@ -178,6 +213,10 @@ class ToolSource:
 class ActivateCondition:
     """This class represents the activate condition of a node."""
 
+    # No per-instance __dict__; these classes have no field defaults, so a
+    # manual __slots__ is compatible with @dataclass on Python 3.8.
+    __slots__ = ("condition", "condition_value")
+
     condition: InputAssignment
     condition_value: Any
 
@@ -201,6 +240,8 @@ class ActivateCondition:
 class SkipCondition:
     """This class represents the skip condition of a node."""
 
+    __slots__ = ("condition", "condition_value", "return_value")
+
     condition: InputAssignment
     condition_value: Any
     return_value: InputAssignment
@@ -248,11 +289,38 @@ class Node:
         :return: The dict of the node.
         :rtype: dict
         """
-        data = asdict(self, dict_factory=lambda x: {k: v for (k, v) in x if v})
+        # Build the dict field by field; asdict() deep-copied every nested
+        # dataclass (including all input assignments) only for the inputs
+        # entry to be thrown away and re-serialized anyway.
         self.inputs = self.inputs or {}
-        data.update({"inputs": {name: i.serialize() for name, i in self.inputs.items()}})
+        data = {}
+        if self.name:
+            data["name"] = self.name
+        if self.tool:
+            data["tool"] = self.tool
+        if self.inputs:
+            data["inputs"] = {name: i.serialize() for name, i in self.inputs.items()}
+        for key in ("comment", "api", "provider", "module", "connection"):
+            value = getattr(self, key)
+            if value:
+                data[key] = value
         if self.aggregation:
             data["aggregation"] = True
+        if self.enable_cache:
+            data["enable_cache"] = True
+        if self.use_variants:
+            data["use_variants"] = True
+        if self.source:
+            data["source"] = _asdict_without_falsy(self.source)
+        if self.type:
+            data["type"] = self.type
+        if self.skip:
+            data["skip"] = _asdict_without_falsy(self.skip)
+        if self.activate:
+            data["activate"] = _asdict_without_falsy(self.activate)
+        if not self.inputs:
+            data["inputs"] = {}
+        if self.aggregation:
             data["reduce"] = True  # TODO: Remove this fallback.
         return data
 
@@ -265,10 +333,11 @@ class Node:
         :return: The node constructed from the dict.
         :rtype: Node
         """
+        inputs_data = data.get("inputs")
         node = Node(
             name=data.get("name"),
             tool=data.get("tool"),
-            inputs={name: InputAssignment.deserialize(v) for name, v in (data.get("inputs") or {}).items()},
+            inputs={name: InputAssignment.deserialize(v) for name, v in inputs_data.items()} if inputs_data else {},
             comment=data.get("comment", ""),
             api=data.get("api", None),
             provider=data.get("provider", None),
@@ -451,13 +520,18 @@ class Flow:
     def _import_requisites(tools, nodes):
         """This function will import tools/nodes required modules to ensure type exists so flow can be executed."""
         try:
+            # Tools and nodes commonly share modules; import each one once
+            # instead of paying the importlib machinery per occurrence.
+            imported = set()
             # Import tool modules to ensure register_builtins & registered_connections executed
             for tool in tools:
-                if tool.module:
+                if tool.module and tool.module not in imported:
+                    imported.add(tool.module)
                     try_import(tool.module, f"Import tool {tool.name!r} module {tool.module!r} failed.")
             # Import node provider to ensure register_apis executed so that provider & connection exists.
             for node in nodes:
-                if node.module:
+                if node.module and node.module not in imported:
+                    imported.add(node.module)
                     try_import(node.module, f"Import node {node.name!r} provider module {node.module!r} failed.")
         except Exception as e:
             logger.warning("Failed to import modules...")
@@ -474,20 +548,25 @@ class Flow:
         :return: The flow constructed from the dict.
         :rtype: Flow
         """
-        tools = [Tool.deserialize(t) for t in data.get("tools") or []]
-        nodes = [Node.deserialize(n) for n in data.get("nodes") or []]
+        tools_data = data.get("tools")
+        nodes_data = data.get("nodes")
+        tools = [Tool.deserialize(t) for t in tools_data] if tools_data else []
+        nodes = [Node.deserialize(n) for n in nodes_data] if nodes_data else []
         Flow._import_requisites(tools, nodes)
-        inputs = data.get("inputs") or {}
-        outputs = data.get("outputs") or {}
+        inputs = data.get("inputs")
+        outputs = data.get("outputs")
+        node_variants = data.get("node_variants")
         return Flow(
             # TODO: Remove this fallback.
-            data.get("id", data.get("name", "default_flow_id")),
+            data["id"] if "id" in data else data.get("name", "default_flow_id"),
             data.get("name", "default_flow"),
             nodes,
-            {name: FlowInputDefinition.deserialize(i) for name, i in inputs.items()},
-            {name: FlowOutputDefinition.deserialize(o) for name, o in outputs.items()},
+            {name: FlowInputDefinition.deserialize(i) for name, i in inputs.items()} if inputs else {},
+            {name: FlowOutputDefinition.deserialize(o) for name, o in outputs.items()} if outputs else {},
             tools=tools,
-            node_variants={name: NodeVariants.deserialize(v) for name, v in (data.get("node_variants") or {}).items()},
+            node_variants={name: NodeVariants.deserialize(v) for name, v in node_variants.items()}
+            if node_variants
+            else {},
         )
 
     def _apply_default_node_variants(self: "Flow"):
@@ -518,13 +597,24 @@ class Flow:
         sys.path.insert(0, str(working_dir))
         return working_dir
 
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _from_yaml_cached(flow_file: str, mtime_ns: int) -> "Flow":
+        # Keyed on (path, mtime) so that editing the file invalidates the
+        # entry; batch runs and test harnesses load the same flow repeatedly.
+        # Hand the parser the whole file as bytes: libyaml decodes UTF-8 in C
+        # and scans the buffer directly, with no Python-level read loop.
+        return Flow.deserialize(yaml.load(Path(flow_file).read_bytes(), Loader=YamlSafeLoader))
+
     @staticmethod
     def from_yaml(flow_file: Path, working_dir=None) -> "Flow":
         """Load flow from yaml file."""
         working_dir = Flow._resolve_working_dir(flow_file, working_dir)
-        with open(working_dir / flow_file, "r") as fin:
-            flow = Flow.deserialize(yaml.safe_load(fin))
-            flow._set_tool_loader(working_dir)
+        flow_path = working_dir / flow_file
+        # Return a copy so that callers mutating the flow (node overrides,
+        # variant application) do not poison the cached instance.
+        flow = copy.deepcopy(Flow._from_yaml_cached(str(flow_path), flow_path.stat().st_mtime_ns))
+        flow._set_tool_loader(working_dir)
         return flow
 
     def _set_tool_loader(self, working_dir):
@@ -561,54 +651,90 @@ class Flow:
 
     def has_aggregation_node(self):
         """Return whether the flow has aggregation node."""
-        return any(n.aggregation for n in self.nodes)
+        # Scanned repeatedly by the executor; cache per nodes list like the
+        # name indexes.
+        if getattr(self, "_has_aggregation_source", None) is not self.nodes:
+            self._has_aggregation = any(n.aggregation for n in self.nodes)
+            self._has_aggregation_source = self.nodes
+        return self._has_aggregation
+
+    def _get_node_index(self) -> Dict[str, Node]:
+        # Lazily index nodes by name; the index is rebuilt whenever the nodes
+        # list is replaced, and dropped explicitly on in-place mutation.
+        if getattr(self, "_node_index_source", None) is not self.nodes:
+            self._node_index = {node.name: node for node in self.nodes}
+            self._node_index_source = self.nodes
+        return self._node_index
+
+    def _get_tool_index(self) -> Dict[str, Tool]:
+        if getattr(self, "_tool_index_source", None) is not self.tools:
+            self._tool_index = {tool.name: tool for tool in self.tools}
+            self._tool_index_source = self.tools
+        return self._tool_index
 
     def get_node(self, node_name):
         """Return the node with the given name."""
-        return next((n for n in self.nodes if n.name == node_name), None)
+        return self._get_node_index().get(node_name)
 
     def get_tool(self, tool_name):
         """Return the tool with the given name."""
-        return next((t for t in self.tools if t.name == tool_name), None)
+        return self._get_tool_index().get(tool_name)
 
     def is_reduce_node(self, node_name):
         """Return whether the node is a reduce node."""
-        node = next((n for n in self.nodes if n.name == node_name), None)
+        node = self.get_node(node_name)
         return node is not None and node.aggregation
 
     def is_normal_node(self, node_name):
         """Return whether the node is a normal node."""
-        node = next((n for n in self.nodes if n.name == node_name), None)
+        node = self.get_node(node_name)
         return node is not None and not node.aggregation
 
     def is_llm_node(self, node):
         """Given a node, return whether it uses LLM tool."""
         return node.type == ToolType.LLM
 
+    def _get_output_referenced_names(self) -> set:
+        # Node names referenced by flow outputs, indexed once per outputs dict
+        # so that per-node checks during validation are set lookups.
+        if getattr(self, "_output_refs_source", None) is not self.outputs:
+            self._output_refs = {
+                output.reference.value
+                for output in self.outputs.values()
+                if output.reference.value_type is InputValueType.NODE_REFERENCE
+            }
+            self._output_refs_source = self.outputs
+        return self._output_refs
+
+    def _get_node_referenced_names(self) -> set:
+        # Node names referenced by some node's inputs; same identity guard as
+        # the name indexes, so in-place node replacement drops it too.
+        if getattr(self, "_node_refs_source", None) is not self.nodes:
+            self._node_refs = {
+                input.value
+                for flow_node in self.nodes
+                if flow_node.inputs
+                for input in flow_node.inputs.values()
+                if input.value_type is InputValueType.NODE_REFERENCE
+            }
+            self._node_refs_source = self.nodes
+        return self._node_refs
+
     def is_referenced_by_flow_output(self, node):
         """Given a node, return whether it is referenced by output."""
-        return any(
-            output
-            for output in self.outputs.values()
-            if all(
-                (
-                    output.reference.value_type == InputValueType.NODE_REFERENCE,
-                    output.reference.value == node.name,
-                )
-            )
-        )
+        return node.name in self._get_output_referenced_names()
 
     def is_node_referenced_by(self, node: Node, other_node: Node):
         """Given two nodes, return whether the first node is referenced by the second node."""
         return other_node.inputs and any(
             input
             for input in other_node.inputs.values()
-            if input.value_type == InputValueType.NODE_REFERENCE and input.value == node.name
+            if input.value_type is InputValueType.NODE_REFERENCE and input.value == node.name
         )
 
     def is_referenced_by_other_node(self, node):
         """Given a node, return whether it is referenced by other node."""
-        return any(flow_node for flow_node in self.nodes if self.is_node_referenced_by(node, flow_node))
+        return node.name in self._get_node_referenced_names()
 
     def is_chat_flow(self):
         """Return whether the flow is a chat flow."""
@@ -617,43 +743,66 @@ class Flow:
 
     def get_chat_input_name(self):
         """Return the name of the chat input."""
-        return next((name for name, i in self.inputs.items() if i.is_chat_input), None)
+        if getattr(self, "_chat_input_name_source", None) is not self.inputs:
+            self._chat_input_name = next((name for name, i in self.inputs.items() if i.is_chat_input), None)
+            self._chat_input_name_source = self.inputs
+        return self._chat_input_name
 
     def get_chat_output_name(self):
         """Return the name of the chat output."""
-        return next((name for name, o in self.outputs.items() if o.is_chat_output), None)
+        if getattr(self, "_chat_output_name_source", None) is not self.outputs:
+            self._chat_output_name = next((name for name, o in self.outputs.items() if o.is_chat_output), None)
+            self._chat_output_name_source = self.outputs
+        return self._chat_output_name
+
+    @staticmethod
+    def _get_connection_input_names(tool: Tool) -> List[str]:
+        # The possible connection keys only depend on the tool's input types;
+        # compute them once per tool and cache on the instance (kept off the
+        # dataclass fields so serialization is unaffected).
+        connection_input_names = getattr(tool, "_connection_input_names", None)
+        if connection_input_names is None:
+            connection_input_names = [
+                k
+                for k, v in tool.inputs.items()
+                # Any non-value type makes the key a possible connection key.
+                if not all((typ.value if isinstance(typ, Enum) else typ).lower() in _VALUE_TYPES for typ in v.type)
+            ]
+            tool._connection_input_names = connection_input_names
+        return connection_input_names
 
     def _get_connection_name_from_tool(self, tool: Tool, node: Node):
         connection_names = {}
-        value_types = set({v.value for v in ValueType.__members__.values()})
-        for k, v in tool.inputs.items():
-            input_type = [typ.value if isinstance(typ, Enum) else typ for typ in v.type]
-            if all(typ.lower() in value_types for typ in input_type):
-                # All type is value type, the key is not a possible connection key.
-                continue
+        for k in self._get_connection_input_names(tool):
             input_assignment = node.inputs.get(k)
             # Add literal node assignment values to results, skip node reference
-            if isinstance(input_assignment, InputAssignment) and input_assignment.value_type == InputValueType.LITERAL:
+            if isinstance(input_assignment, InputAssignment) and input_assignment.value_type is InputValueType.LITERAL:
                 connection_names[k] = input_assignment.value
         return connection_names
 
+    def _get_resolved_nodes(self) -> List[Node]:
+        # Variant resolution is deterministic for a given nodes list, so cache
+        # it with the same identity guard as the name indexes.
+        if getattr(self, "_resolved_nodes_source", None) is not self.nodes:
+            self._resolved_nodes = [
+                self._apply_default_node_variant(node, self.node_variants) if node.use_variants else node
+                for node in self.nodes
+            ]
+            self._resolved_nodes_source = self.nodes
+        return self._resolved_nodes
+
     def get_connection_names(self):
         """Return connection names."""
-        connection_names = set({})
-        nodes = [
-            self._apply_default_node_variant(node, self.node_variants) if node.use_variants else node
-            for node in self.nodes
-        ]
-        for node in nodes:
-            if node.connection:
-                connection_names.add(node.connection)
-                continue
-            if node.type == ToolType.PROMPT or node.type == ToolType.LLM:
+        resolved_nodes = self._get_resolved_nodes()
+        connection_names = {node.connection for node in resolved_nodes if node.connection}
+        for node in resolved_nodes:
+            if node.connection or node.type == ToolType.PROMPT or node.type == ToolType.LLM:
                 continue
             tool = self.get_tool(node.tool) or self._tool_loader.load_tool_for_node(node)
             if tool:
-                connection_names.update(self._get_connection_name_from_tool(tool, node).values())
-        return set({item for item in connection_names if item})
+                # Filter falsy values inline instead of rebuilding the set at the end.
+                connection_names.update(v for v in self._get_connection_name_from_tool(tool, node).values() if v)
+        return connection_names
 
     def get_connection_input_names_for_node(self, node_name):
         """Return connection input names."""
@@ -674,3 +823,8 @@ class Flow:
                 self.nodes[index] = variant_node
                 break
         self.tools = self.tools + variant_tools
+        # The nodes list was mutated in place; drop the derived caches.
+        self._node_index_source = None
+        self._resolved_nodes_source = None
+        self._node_refs_source = None
+        self._has_aggregation_source = None
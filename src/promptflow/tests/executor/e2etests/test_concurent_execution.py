@@ -5,7 +5,8 @@ from tempfile import mkdtemp
 import pytest
 
 from promptflow._utils.exception_utils import ErrorResponse
-from promptflow._utils.logger_utils import LogContext
+from promptflow._utils.logger_utils import LogContext, flow_logger, flush_logger
+from promptflow._utils.logger_utils import logger as execution_logger
 from promptflow.contracts.run_info import Status
 from promptflow.contracts.run_mode import RunMode
 from promptflow.executor._flow_nodes_scheduler import RUN_FLOW_NODES_LINEARLY
@@ -28,6 +29,8 @@ class TestConcurrentExecution:
         # flow run: test exec_line
         with LogContext(flow_run_log_path, run_mode=RunMode.Test):
             results = executor.exec_line(get_flow_inputs(FLOW_FOLDER))
+            flush_logger(execution_logger)
+            flush_logger(flow_logger)
             log_content = load_content(flow_run_log_path)
             pattern = r"\[wait_(\d+) in line None.*Thread (\d+)"
             matches = re.findall(pattern, log_content)
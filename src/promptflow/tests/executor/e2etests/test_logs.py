@@ -3,7 +3,8 @@ from tempfile import mkdtemp
 
 import pytest
 
-from promptflow._utils.logger_utils import LogContext
+from promptflow._utils.logger_utils import LogContext, bulk_logger, flow_logger, flush_logger
+from promptflow._utils.logger_utils import logger as execution_logger
 from promptflow.contracts.run_info import Status
 from promptflow.contracts.run_mode import RunMode
 from promptflow.executor import FlowExecutor
@@ -70,6 +71,8 @@ class TestExecutorLogs:
         with LogContext(flow_run_log_path):
             executor = FlowExecutor.create(get_yaml_file(folder_name), {})
             executor.exec_line({"text": "line_text"})
+            flush_logger(execution_logger)
+            flush_logger(flow_logger)
             log_content = load_content(flow_run_log_path)
             loggers_name_list = ["execution", "execution.flow"]
             assert all(logger in log_content for logger in loggers_name_list)
@@ -79,6 +82,8 @@ class TestExecutorLogs:
         with LogContext(bulk_run_log_path, run_mode=RunMode.Batch):
             bulk_inputs = [{"text": f"text_{idx}"} for idx in range(10)]
             executor.exec_bulk(bulk_inputs)
+            flush_logger(execution_logger)
+            flush_logger(bulk_logger)
             log_content = load_content(bulk_run_log_path)
             loggers_name_list = ["execution", "execution.bulk"]
             assert all(logger in log_content for logger in loggers_name_list)
@@ -96,6 +101,8 @@ class TestExecutorLogs:
         with LogContext(flow_run_log_path, run_mode=RunMode.Test):
             executor = FlowExecutor.create(get_yaml_file(folder_name), {})
             executor.exec_line({"text": "line_text"})
+            flush_logger(execution_logger)
+            flush_logger(flow_logger)
             log_content = load_content(flow_run_log_path)
             node_logs_list = ["print_input in line", "stdout> STDOUT:", "stderr> STDERR:"]
             assert all(node_log in log_content for node_log in node_logs_list)
@@ -105,6 +112,8 @@ class TestExecutorLogs:
         with LogContext(bulk_run_log_path, run_mode=RunMode.Batch):
             bulk_inputs = [{"text": f"text_{idx}"} for idx in range(10)]
             executor.exec_bulk(bulk_inputs)
+            flush_logger(execution_logger)
+            flush_logger(bulk_logger)
             log_content = load_content(bulk_run_log_path)
             node_logs_list = ["print_input in line", "stderr> STDERR:"]
             assert all(node_log in log_content for node_log in node_logs_list)
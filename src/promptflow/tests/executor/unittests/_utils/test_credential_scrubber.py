@@ -41,6 +41,17 @@ class TestCredentialScrubber:
         assert len(scrubber.custom_str_set) == 1
         assert scrubber.scrub("test&secret=credential") == f"test&secret={CredentialScrubber.PLACE_HOLDER}"
 
+    def test_from_list(self):
+        scrubber = CredentialScrubber.from_list(["secret data", "secret data 123", None, "yy"])
+        # None and strings at or below the length threshold are dropped.
+        assert scrubber.custom_str_set == {"secret data", "secret data 123"}
+        # Longest secret wins, so one containing another is scrubbed in full.
+        output = scrubber.scrub("print secret data 123&secret data")
+        assert output == f"print {CredentialScrubber.PLACE_HOLDER}&{CredentialScrubber.PLACE_HOLDER}"
+        # Strings added afterwards are picked up on the next scrub.
+        scrubber.add_str("credential")
+        assert scrubber.scrub("test&secret=credential") == f"test&secret={CredentialScrubber.PLACE_HOLDER}"
+
     def test_add_str_length_threshold(self):
         """If the secret is too short (length <= 2 chars), it will not be scrubbed."""
         scrubber = CredentialScrubber()
@@ -4,18 +4,19 @@ import time
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from tempfile import mkdtemp
-from unittest.mock import Mock
 from uuid import uuid4
 
 import pytest
 
 from promptflow._utils.credential_scrubber import CredentialScrubber
 from promptflow._utils.logger_utils import (
+    BufferedFileHandler,
     CredentialScrubberFormatter,
     FileHandler,
     FileHandlerConcurrentWrapper,
     LogContext,
     bulk_logger,
+    flush_logger,
     scrub_credentials,
     update_log_path,
 )
@@ -141,11 +142,28 @@ class TestFileHandlerConcurrentWrapper:
 
         log_path = str(Path(mkdtemp()) / "logs.log")
         file_handler = FileHandler(log_path)
-        file_handler.close = Mock(side_effect=Exception("test exception"))
         wrapper.handler = file_handler
 
         wrapper.clear()
         assert wrapper.handler is None
+        # Closing is idempotent, so clearing an already-closed handler is safe.
+        file_handler.close()
+
+
+@pytest.mark.unittest
+class TestFileHandler:
+    def test_flush_visibility(self, monkeypatch):
+        # Disarm the periodic flush so the emptiness check cannot race it.
+        monkeypatch.setattr(BufferedFileHandler, "FLUSH_INTERVAL_SECONDS", 600)
+        log_path = str(Path(mkdtemp()) / "logs.log")
+        handler = FileHandler(log_path)
+        record = logging.LogRecord("flush_test", logging.INFO, __file__, 0, "buffered message", None, None)
+        handler.emit(record)
+        # Small records sit in the in-memory buffer until a flush.
+        assert load_content(log_path) == ""
+        handler.flush()
+        assert "buffered message" in load_content(log_path)
+        handler.close()
 
 
 @pytest.mark.unittest
@@ -200,6 +218,8 @@ class TestLogContext:
         with LogContext(original_log_path, input_logger=input_logger, run_mode=RunMode.Batch):
             bulk_logger.info("test log")
             input_logger.warning("test input log")
+            flush_logger(bulk_logger)
+            flush_logger(input_logger)
             original_log = load_content(original_log_path)
             keywords = ["test log", "test input log", "execution.bulk", "input_logger", "INFO", "WARNING"]
             assert all(keyword in original_log for keyword in keywords)
@@ -209,6 +229,8 @@ class TestLogContext:
             update_log_path(log_path, input_logger)
             bulk_logger.info("test update log")
             input_logger.warning("test update input log")
+            flush_logger(bulk_logger)
+            flush_logger(input_logger)
             log = load_content(log_path)
             keywords = ["test update log", "test update input log", "execution.bulk", "input_logger", "INFO", "WARNING"]
             assert all(keyword in log for keyword in keywords)
@@ -1,6 +1,10 @@
+import os
+import shutil
+from pathlib import Path
+from tempfile import mkdtemp
+
 import pytest
 import yaml
-from pathlib import Path
 
 from promptflow.contracts._errors import NodeConditionConflict
 from promptflow.contracts.flow import Flow
@@ -50,6 +54,26 @@ class TestFlowContract:
         connection_names = flow.get_connection_input_names_for_node(flow.nodes[0].name)
         assert connection_names == ['connection']
 
+    def test_flow_from_yaml_cache(self):
+        flow_folder = "flow_with_dict_input_with_variant"
+        flow_file = Path(mkdtemp()) / "flow.dag.yaml"
+        shutil.copyfile(get_yaml_file(flow_folder), flow_file)
+
+        flow = Flow.from_yaml(flow_file)
+        reloaded = Flow.from_yaml(flow_file)
+        # Loads are isolated copies; mutating one must not leak into the next.
+        assert reloaded is not flow
+        assert reloaded.nodes[0] is not flow.nodes[0]
+        node_name = flow.nodes[0].name
+        flow.nodes[0].name = "mutated"
+        assert Flow.from_yaml(flow_file).nodes[0].name == node_name
+
+        # Changing the file on disk invalidates the cached entry.
+        flow_file.write_text(flow_file.read_text().replace(node_name, "renamed"))
+        mtime_ns = flow_file.stat().st_mtime_ns
+        os.utime(flow_file, ns=(mtime_ns + 1, mtime_ns + 1))
+        assert Flow.from_yaml(flow_file).nodes[0].name == "renamed"
+
     def test_node_condition_conflict(self):
         flow_folder = "node_condition_conflict"
         flow_yaml = get_yaml_file(flow_folder, root=WRONG_FLOW_ROOT)